@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Real Selection - Síntese de voz em tempo real a partir de texto selecionado
+Copyright (C) 2025 Renato Barros
+
+Este programa é software livre: você pode redistribuí-lo e/ou modificá-lo
+sob os termos da GNU General Public License conforme publicada pela
+Free Software Foundation, versão 3 da Licença, ou (a seu critério)
+qualquer versão posterior.
+
+Este programa é distribuído na esperança de que seja útil, mas SEM QUALQUER
+GARANTIA; sem mesmo a garantia implícita de COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM
+PROPÓSITO ESPECÍFICO. Consulte a GNU General Public License para mais detalhes.
+
+Você deve ter recebido uma cópia da GNU General Public License junto com este
+programa. Caso contrário, consulte <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Cliente leve do daemon TTS: pede ao daemon para ler a seleção primária via
+socket Unix. Não importa torch/kokoro nem executa wl-paste (o daemon mantém
+um monitor da seleção), então termina em poucos ms.
+
+Sem daemon rodando, cai para o fluxo completo de main.py (carrega o modelo).
+
+Protocolo (uma linha JSON por conexão):
+- {"comando": "ler"}      → sintetiza a seleção primária atual
+- {"texto": "..."}        → sintetiza o texto (interrompe o que estiver tocando)
+- {"comando": "parar"}    → interrompe playback
+Resposta: {"ok": true} ou {"ok": false, "erro": "..."}
+"""
+
+import sys
+import os
+import json
+import socket
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+
+def caminho_socket() -> Path:
+    """Socket do daemon em $XDG_RUNTIME_DIR (fallback: diretório temporário)."""
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(base) / "real_selection.sock"
+
+
+def enviar_pedido(pedido: dict, timeout: float = 5.0) -> Optional[dict]:
+    """
+    Envia pedido ao daemon e retorna a resposta.
+
+    None somente se o daemon não estiver rodando (socket ausente ou recusado).
+    Timeout ou resposta inválida viram {"ok": false}: o daemon existe e pode
+    estar falando, então o cliente não deve sintetizar por conta própria.
+    O timeout cobre o fallback de 2s do wl-paste no pedido "ler".
+    """
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexao:
+            conexao.settimeout(timeout)
+            conexao.connect(str(caminho_socket()))
+            conexao.sendall(json.dumps(pedido).encode("utf-8") + b"\n")
+
+            resposta = json.loads(conexao.makefile("rb").readline())
+
+    except (FileNotFoundError, ConnectionRefusedError):
+        logger.debug("Daemon não encontrado")
+        return None
+
+    except (socket.timeout, ValueError) as e:
+        return {"ok": False, "erro": f"resposta inválida do daemon ({e})"}
+
+    if not isinstance(resposta, dict):
+        return {"ok": False, "erro": "resposta inválida do daemon"}
+
+    return resposta
+
+
+def main():
+    """Pede ao daemon para ler a seleção (ou sintetiza localmente)."""
+    if "--parar" in sys.argv[1:]:
+        resposta = enviar_pedido({"comando": "parar"})
+        return 0 if resposta and resposta.get("ok") else 1
+
+    resposta = enviar_pedido({"comando": "ler"})
+
+    if resposta is None:
+        logger.warning("Daemon não está rodando, sintetizando localmente")
+        from real_selection import main as local
+        return local.main()
+
+    if not resposta.get("ok"):
+        logger.warning(f"Pedido ao daemon falhou: {resposta.get('erro')}")
+        return 1
+
+    logger.info("Seleção enviada ao daemon")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
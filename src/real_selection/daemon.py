@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Real Selection - Síntese de voz em tempo real a partir de texto selecionado
+Copyright (C) 2025 Renato Barros
+
+Este programa é software livre: você pode redistribuí-lo e/ou modificá-lo
+sob os termos da GNU General Public License conforme publicada pela
+Free Software Foundation, versão 3 da Licença, ou (a seu critério)
+qualquer versão posterior.
+
+Este programa é distribuído na esperança de que seja útil, mas SEM QUALQUER
+GARANTIA; sem mesmo a garantia implícita de COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM
+PROPÓSITO ESPECÍFICO. Consulte a GNU General Public License para mais detalhes.
+
+Você deve ter recebido uma cópia da GNU General Public License junto com este
+programa. Caso contrário, consulte <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Daemon TTS: carrega o pipeline Kokoro uma única vez e atende pedidos do
+cliente (cliente.py) via socket Unix, eliminando o coldstart (CUDA + modelo)
+a cada atalho.
+
+Arquitetura:
+- Thread principal: aceita conexões e responde na hora (cliente não espera áudio)
+- Worker: processa um texto por vez com processar_tts (stream e buffers reaproveitados)
+- Pedido novo interrompe o que estiver tocando; só o mais recente é mantido
+
+Uso:
+    uv run real_selection_daemon   (ou via systemd --user)
+"""
+
+import sys
+import os
+import atexit
+import json
+import queue
+import signal
+import socket
+import threading
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from real_selection.cliente import caminho_socket
+from real_selection.selecao import (
+    iniciar_monitor_selecao,
+    obter_selecao_primaria,
+    limpar_texto_para_tts,
+)
+from real_selection.main import (
+    configurar_logging,
+    inicializar_pipeline,
+    processar_tts,
+    liberar_audio,
+)
+from kokoro import KPipeline
+
+
+class ServidorTTS:
+    """
+    Escuta no socket Unix e repassa textos para o worker de síntese.
+    Fila de pedidos com no máximo um item pendente (o mais recente vence).
+
+    Cada pedido leva o próprio evento de cancelamento: interromper() seta os
+    eventos de todos os pedidos não concluídos, então um "parar" que chega
+    entre o get() do worker e o início do playback não se perde.
+    """
+
+    def __init__(self, pipeline: KPipeline, caminho: Path):
+        self.pipeline = pipeline
+        self.caminho = caminho
+        self.pedidos = queue.Queue()
+        self.parado = threading.Event()
+        self._lock = threading.Lock()
+        self._ativos = set()  # eventos de cancelamento dos pedidos não concluídos
+        self.worker = threading.Thread(target=self._processar_pedidos, name="TTSWorker", daemon=True)
+
+    def _processar_pedidos(self):
+        """Worker: sintetiza um texto por vez até receber None."""
+        while True:
+            pedido = self.pedidos.get()
+
+            if pedido is None:
+                break
+
+            texto, cancelar = pedido
+
+            # Cancelado enquanto esperava (pedido mais novo ou "parar")
+            if cancelar.is_set():
+                continue
+
+            # Um pedido com erro não pode derrubar o worker (e o daemon)
+            try:
+                processar_tts(texto, self.pipeline, cancelar)
+            except Exception as e:
+                logger.exception(f"Erro ao processar pedido: {e}")
+            finally:
+                with self._lock:
+                    self._ativos.discard(cancelar)
+
+    def _descartar_pendentes(self):
+        while True:
+            try:
+                self.pedidos.get_nowait()
+            except queue.Empty:
+                return
+
+    def interromper(self):
+        """Descarta pedidos pendentes e para o playback atual."""
+        with self._lock:
+            for cancelar in self._ativos:
+                cancelar.set()
+            self._ativos.clear()
+
+        self._descartar_pendentes()
+
+    def enfileirar(self, texto: str):
+        """Interrompe o que estiver tocando e agenda texto com evento próprio."""
+        self.interromper()
+
+        cancelar = threading.Event()
+        with self._lock:
+            self._ativos.add(cancelar)
+        self.pedidos.put((texto, cancelar))
+
+    @staticmethod
+    def _responder(conexao: socket.socket, ok: bool, erro: Optional[str] = None):
+        resposta = {"ok": ok} if ok else {"ok": ok, "erro": erro}
+        conexao.sendall(json.dumps(resposta).encode("utf-8") + b"\n")
+
+    def _atender(self, conexao: socket.socket):
+        """Lê uma linha JSON, responde e enfileira o texto (se houver)."""
+        with conexao:
+            conexao.settimeout(2.0)  # cliente travado não bloqueia o daemon
+            linha = conexao.makefile("rb").readline()
+
+            try:
+                pedido = json.loads(linha)
+            except ValueError:  # JSONDecodeError ou UTF-8 inválido
+                self._responder(conexao, False, "JSON inválido")
+                return
+
+            if not isinstance(pedido, dict):
+                self._responder(conexao, False, "pedido deve ser um objeto JSON")
+                return
+
+            if pedido.get("comando") == "parar":
+                logger.info("Pedido de interrupção recebido")
+                self.interromper()
+
+            elif pedido.get("comando") == "ler":
+                texto = limpar_texto_para_tts(obter_selecao_primaria() or "")
+
+                if not texto:
+                    self._responder(conexao, False, "Nenhum texto selecionado")
+                    return
+
+                logger.info(f"Seleção recebida: {len(texto)} caracteres")
+                self.enfileirar(texto)
+
+            elif "texto" in pedido:
+                if not isinstance(pedido["texto"], str):
+                    self._responder(conexao, False, "texto deve ser uma string")
+                    return
+
+                # Mesma limpeza do caminho "ler" (e do modo local)
+                texto = limpar_texto_para_tts(pedido["texto"])
+
+                if not texto:
+                    self._responder(conexao, False, "Texto vazio após limpeza")
+                    return
+
+                logger.info(f"Pedido recebido: {len(texto)} caracteres")
+                self.enfileirar(texto)
+
+            else:
+                self._responder(conexao, False, "pedido desconhecido")
+                return
+
+            self._responder(conexao, True)
+
+    def _abrir_socket(self) -> Optional[socket.socket]:
+        """Cria o socket; remove arquivo órfão, mas não rouba de outro daemon."""
+        if self.caminho.exists():
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as teste:
+                    teste.connect(str(self.caminho))
+                logger.error(f"Daemon já está rodando ({self.caminho})")
+                return None
+            except ConnectionRefusedError:
+                self.caminho.unlink()
+
+        servidor = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        servidor.bind(str(self.caminho))
+        os.chmod(self.caminho, 0o600)  # apenas o usuário dono
+        servidor.listen()
+        servidor.settimeout(0.5)  # permite checar self.parado
+        return servidor
+
+    def servir(self) -> int:
+        servidor = self._abrir_socket()
+        if servidor is None:
+            return 1
+
+        self.worker.start()
+        logger.info(f"Daemon escutando em {self.caminho}")
+
+        try:
+            while not self.parado.is_set():
+                try:
+                    conexao, _ = servidor.accept()
+                except socket.timeout:
+                    continue
+
+                try:
+                    self._atender(conexao)
+                except Exception as e:
+                    logger.exception(f"Erro ao atender pedido: {e}")
+
+        finally:
+            servidor.close()
+            self.caminho.unlink(missing_ok=True)
+            self.interromper()
+            self.pedidos.put(None)
+            self.worker.join(timeout=2.0)
+            logger.info("Daemon encerrado")
+
+        return 0
+
+    def parar(self, signum, frame):
+        """Handler de SIGINT/SIGTERM."""
+        logger.warning(f"Interrupção detectada ({signal.Signals(signum).name})")
+        self.parado.set()
+
+
+def main():
+    """Inicializa pipeline uma vez e atende pedidos até SIGINT/SIGTERM."""
+    configurar_logging()
+    atexit.register(liberar_audio)
+
+    logger.info("=" * 60)
+    logger.info("TTS de Seleção Primária - Daemon")
+    logger.info("=" * 60)
+
+    # Inicialização preguiçosa da GPU (contexto, kernels) acontece agora,
+    # não no primeiro atalho
+    pipeline = inicializar_pipeline(
+        compilar=os.environ.get("TTS_COMPILAR") == "1",
+        quantizar=os.environ.get("TTS_QUANTIZAR") == "1",
+        aquecer=True
+    )
+
+    if pipeline is None:
+        logger.error("Falha ao inicializar pipeline")
+        return 1
+
+    # Um único wl-paste --watch: pedidos "ler" usam a seleção já recebida
+    monitor = iniciar_monitor_selecao()
+
+    servidor = ServidorTTS(pipeline, caminho_socket())
+    signal.signal(signal.SIGINT, servidor.parar)
+    signal.signal(signal.SIGTERM, servidor.parar)
+
+    try:
+        return servidor.servir()
+    finally:
+        # Sem isso o wl-paste --watch fica órfão quando o daemon encerra
+        monitor.parar()
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except Exception as e:
+        logger.exception(f"Erro fatal: {e}")
+        sys.exit(1)
@@ -0,0 +1,98 @@
+"""
+Real Selection - Síntese de voz em tempo real a partir de texto selecionado
+Copyright (C) 2025 Renato Barros
+
+Este programa é software livre: você pode redistribuí-lo e/ou modificá-lo
+sob os termos da GNU General Public License conforme publicada pela
+Free Software Foundation, versão 3 da Licença, ou (a seu critério)
+qualquer versão posterior.
+
+Este programa é distribuído na esperança de que seja útil, mas SEM QUALQUER
+GARANTIA; sem mesmo a garantia implícita de COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM
+PROPÓSITO ESPECÍFICO. Consulte a GNU General Public License para mais detalhes.
+
+Você deve ter recebido uma cópia da GNU General Public License junto com este
+programa. Caso contrário, consulte <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Fila SPSC (um producer, um consumer) usada entre a geração e o callback de
+áudio. Separada de main.py para não importar torch/pyaudio (testável isolada).
+"""
+
+import threading
+
+
+class SPSCQueue:
+    """
+    Ring buffer de tamanho fixo para um único producer e um único consumer.
+
+    Cada índice tem um único escritor (_tail = producer, _head = consumer) e
+    atribuição de int é atômica no CPython, então put/get não usam Lock.
+    Event.set()/clear() adquirem o lock interno do Event; por isso o lado que
+    vai bloquear (fila vazia/cheia) marca uma flag antes de esperar e o outro
+    lado só chama set() quando a flag está ativa. Sem ninguém esperando,
+    put/get não tocam em lock. Guarda referências (não copia os arrays).
+
+    fechar() desbloqueia os dois lados: put passa a descartar e get devolve
+    None quando não houver mais itens.
+    """
+
+    def __init__(self, maxsize: int = 10):
+        self._slots = [None] * maxsize
+        self._maxsize = maxsize
+        self._head = 0  # próximo a ler (só consumer escreve)
+        self._tail = 0  # próximo a escrever (só producer escreve)
+        self._nao_vazia = threading.Event()
+        self._nao_cheia = threading.Event()
+        # Marcadas antes do re-teste que precede wait(): quem avança o índice
+        # depois do re-teste vê a flag e acorda o outro lado
+        self._consumer_esperando = False
+        self._producer_esperando = False
+        self.fechada = False
+
+    def qsize(self) -> int:
+        return self._tail - self._head
+
+    def fechar(self) -> None:
+        self.fechada = True
+        self._nao_vazia.set()
+        self._nao_cheia.set()
+
+    def put(self, item) -> None:
+        """Enfileira item; bloqueia enquanto a fila estiver cheia (backpressure)."""
+        while self._tail - self._head >= self._maxsize:
+            if self.fechada:
+                return
+            self._producer_esperando = True
+            self._nao_cheia.clear()
+            if self._tail - self._head >= self._maxsize and not self.fechada:
+                self._nao_cheia.wait()
+            self._producer_esperando = False
+
+        if self.fechada:
+            return
+
+        self._slots[self._tail % self._maxsize] = item
+        self._tail += 1
+        if self._consumer_esperando:
+            self._nao_vazia.set()
+
+    def get(self):
+        """Desenfileira item; bloqueia enquanto a fila estiver vazia."""
+        while self._tail == self._head:
+            if self.fechada:
+                return None
+            self._consumer_esperando = True
+            self._nao_vazia.clear()
+            if self._tail == self._head and not self.fechada:
+                self._nao_vazia.wait()
+            self._consumer_esperando = False
+
+        indice = self._head % self._maxsize
+        item = self._slots[indice]
+        self._slots[indice] = None  # libera referência ao chunk
+        self._head += 1
+        if self._producer_esperando:
+            self._nao_cheia.set()
+        return item
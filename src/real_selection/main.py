@@ -22,7 +22,7 @@ voz em português brasileiro usando Kokoro TTS com streaming em tempo real.
 
 Arquitetura:
 - Producer thread: gera chunks de áudio via Kokoro (GPU)
-- Consumer thread: reproduz chunks via PyAudio
+- Consumer: callback do PortAudio reproduz chunks via PyAudio
 - Queue de até 10 chunks para buffering mínimo
 
 Dependências externas:
@@ -32,21 +32,30 @@ Dependências externas:
 
 import sys
 import os
-import subprocess
-import re
+import atexit
 import time
 import threading
-import queue
 import signal
 from pathlib import Path
 from typing import Optional
 
+# Precisa ser definido antes de importar torch: segmentos expansíveis evitam
+# fragmentação do allocator com chunks de tamanhos variados (usuário pode sobrescrever)
+os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+
 import numpy as np
 import pyaudio
 import torch
 from loguru import logger
 from kokoro import KPipeline
 
+from real_selection.fila import SPSCQueue
+from real_selection.selecao import (
+    obter_selecao_primaria,
+    limpar_texto_para_tts,
+    iter_sentencas,
+)
+
 
 # ============================================================================
 # LOGGING
@@ -57,6 +66,10 @@ def configurar_logging():
     Console: INFO (mensagens relevantes para usuário)
     Arquivo: DEBUG (troubleshooting detalhado)
     Rotação: 10 MB, últimos 5 arquivos compactados
+
+    Arquivo usa enqueue=True: producer e callback do PortAudio só enfileiram
+    o registro; a escrita em disco (e rotação/compressão) fica numa thread
+    do loguru, fora do caminho do áudio.
     """
     logger.remove()
 
@@ -78,128 +91,141 @@ def configurar_logging():
         level="DEBUG",
         rotation="10 MB",
         retention=5,
-        compression="zip"
+        compression="zip",
+        enqueue=True
     )
 
+    # Último atexit a rodar (registrado primeiro): esvazia a fila do arquivo
+    atexit.register(logger.remove)
+
     logger.debug("Sistema de logging configurado")
 
 
 # ============================================================================
-# CAPTURA E LIMPEZA DE TEXTO
+# THREADS DE PRODUÇÃO E CONSUMO
 # ============================================================================
 
-def obter_selecao_primaria() -> Optional[str]:
-    """
-    Captura via wl-paste --primary (seleção do mouse no Wayland).
-    Timeout de 2s previne travamentos se clipboard não responder.
-    """
-    logger.debug("Executando wl-paste --primary")
+# Chunks enfileirados no máximo entre producer e consumer
+TAMANHO_FILA_AUDIO = 10
 
-    try:
-        texto = subprocess.check_output(
-            ["wl-paste", "--primary"],
-            text=True,
-            stderr=subprocess.DEVNULL,
-            timeout=2
-        )
+# Maior chunk aceito pelos buffers pré-alocados (20s a 24kHz); acima disso o
+# producer cai no caminho com alocação
+AMOSTRAS_MAX_CHUNK = 24000 * 20
 
-        texto = texto.strip()
-        logger.debug(f"Texto capturado: {len(texto)} caracteres")
-        return texto
 
-    except FileNotFoundError:
-        logger.error("wl-clipboard não está instalado")
-        logger.error("Instale com: sudo pacman -S wl-clipboard")
-        return None
-
-    except subprocess.TimeoutExpired:
-        logger.error("Timeout ao capturar seleção")
-        return None
-
-    except subprocess.CalledProcessError:
-        # Seleção vazia não é erro
-        logger.debug("Seleção primária vazia")
-        return ""
-
-    except Exception as e:
-        logger.exception(f"Erro inesperado ao capturar seleção: {e}")
-        return None
-
-
-def limpar_texto_para_tts(texto: str) -> Optional[str]:
+def alocar_buffers_audio(quantidade: int) -> list:
     """
-    Remove quebras de linha indesejadas (PDFs, terminal) mas preserva parágrafos.
-    
-    Estratégia:
-    - Quebra simples (\n) → espaço (junta linhas do mesmo parágrafo)
-    - Quebra dupla (\n\n) → mantém (separação entre parágrafos)
+    Pool fixo de buffers float32 no host, reaproveitado em rodízio pelo producer.
+    Memória comum (pageable): o Kokoro já devolve o áudio em CPU, então não há
+    cópia D2H que memória pinned aceleraria.
     """
-    if not texto:
-        return None
-
-    logger.debug("Limpando texto para TTS")
-    logger.debug(f"Original: {len(texto)} chars, {texto.count(chr(10))} quebras")
-
-    # Substitui \n isolado por espaço, mantém \n\n
-    texto_limpo = re.sub(r'(?<!\n)\n(?!\n)', ' ', texto)
-    
-    # Remove espaços múltiplos (mas não quebras)
-    texto_limpo = re.sub(r'[ \t]+', ' ', texto_limpo)
-    texto_limpo = texto_limpo.strip()
-
-    logger.debug(f"Limpo: {len(texto_limpo)} chars, {texto_limpo.count(chr(10))} quebras")
+    logger.debug(f"Alocando {quantidade} buffers de áudio")
 
-    return texto_limpo if texto_limpo else None
+    return [
+        torch.empty(AMOSTRAS_MAX_CHUNK, dtype=torch.float32)
+        for _ in range(quantidade)
+    ]
 
 
-# ============================================================================
-# THREADS DE PRODUÇÃO E CONSUMO
-# ============================================================================
-
 class AudioProducerThread(threading.Thread):
     """
     Gera áudio via Kokoro e enfileira chunks para reprodução.
     Non-daemon: precisa finalizar corretamente para enviar sinal de término.
+
+    Chunks são copiados para buffers pré-alocados usados em rodízio; o pool
+    precisa ter pelo menos maxsize da fila + 2 buffers (fila cheia + chunk
+    tocando + chunk sendo escrito) para nunca sobrescrever áudio pendente.
     """
 
     def __init__(
         self,
         texto: str,
-        audio_queue: queue.Queue,
+        audio_queue: SPSCQueue,
         pipeline: KPipeline,
+        buffers: list,
+        stream_pronto: threading.Event,
+        cancelar: threading.Event,
         voz: str = 'pf_dora',
-        speed: float = 1.0
+        speed: float = 1.0,
+        bf16: bool = False
     ):
         super().__init__(name="AudioProducer", daemon=False)
         self.texto = texto
         self.audio_queue = audio_queue
         self.pipeline = pipeline
+        self.buffers = buffers
+        self.stream_pronto = stream_pronto
+        self.cancelar = cancelar
+        self.bf16 = bf16
         self.voz = voz
         self.speed = speed
         self.erro = None
         self.num_chunks = 0
 
+    def _copiar_para_host(self, audio: torch.Tensor) -> np.ndarray:
+        """Copia tensor para o próximo buffer do pool e devolve view numpy."""
+        buffer = self.buffers[self.num_chunks % len(self.buffers)]
+        amostras = audio.numel()
+
+        if amostras > buffer.numel():
+            logger.debug(f"[Producer] Chunk de {amostras} samples excede buffer, alocando")
+            return np.ascontiguousarray(audio.float().cpu().numpy())
+
+        # copy_ também converte bf16 → float32 (saída sob autocast).
+        # KModel.forward já devolve o áudio em CPU (.cpu() interno): é uma
+        # cópia host → host; tensor ainda na GPU seria copiado de forma síncrona
+        buffer[:amostras].copy_(audio)
+
+        return buffer.numpy()[:amostras]
+
+    def _resultados(self):
+        """
+        Alimenta o pipeline frase a frase (iter_sentencas): o primeiro chunk
+        sai após sintetizar só a primeira frase, mesmo em textos longos.
+        """
+        for janela in iter_sentencas(self.texto):
+            yield from self.pipeline(janela, voice=self.voz, speed=self.speed)
+
     def run(self):
         """Executa pipeline Kokoro e enfileira chunks conforme são gerados."""
         try:
             logger.debug(f"[Producer] Thread iniciada")
             tempo_inicio = time.perf_counter()
 
-            for i, result in enumerate(self.pipeline(self.texto, voice=self.voz, speed=self.speed)):
-                if result.audio is not None:
-                    self.num_chunks += 1
+            # inference_mode: sem bookkeeping de autograd (version counters, requires_grad)
+            # autocast bf16 (opcional, TTS_BF16=1): metade da banda de memória nos matmuls do vocoder
+            with torch.inference_mode(), \
+                    torch.autocast('cuda', dtype=torch.bfloat16, enabled=self.bf16):
+                for result in self._resultados():
+                    if self.cancelar.is_set() or self.audio_queue.fechada:
+                        logger.debug("[Producer] Encerramento solicitado, interrompendo geração")
+                        break
+
+                    if result.audio is not None:
+                        self.num_chunks += 1
                     
-                    # Kokoro retorna torch.Tensor, convertemos para numpy float32
-                    chunk = result.audio.cpu().numpy().astype(np.float32)
+                        # Kokoro retorna torch.Tensor, convertemos para numpy float32
+                        # contíguo (consumer entrega o buffer direto ao PortAudio)
+                        chunk = self._copiar_para_host(result.audio)
 
-                    duracao = len(chunk) / 24000
-                    tamanho_fila = self.audio_queue.qsize()
+                        duracao = len(chunk) / 24000
 
-                    logger.debug(f"[Producer] Chunk {self.num_chunks}: {len(chunk)} samples ({duracao:.2f}s)")
-                    logger.debug(f"[Producer] Fila: {tamanho_fila} chunks aguardando")
-                    logger.info(f"Chunk {self.num_chunks} gerado ({duracao:.2f}s)")
+                        # Argumentos posicionais: loguru formata a mensagem (sem
+                        # f-string nem closures por chunk; o sink DEBUG está sempre ativo)
+                        logger.debug(
+                            "[Producer] Chunk {}: {} samples ({:.2f}s)",
+                            self.num_chunks, len(chunk), duracao
+                        )
+                        logger.debug("[Producer] Fila: {} chunks aguardando", self.audio_queue.qsize())
+                        logger.info(f"Chunk {self.num_chunks} gerado ({duracao:.2f}s)")
 
-                    self.audio_queue.put(chunk)
+                        if self.num_chunks == 1:
+                            # Geração do 1º chunk já sobrepôs a abertura do stream;
+                            # só enfileira depois que o consumer estiver pronto
+                            if not self.stream_pronto.wait(timeout=2.0):
+                                logger.warning("[Producer] Stream não ficou pronto em 2s")
+
+                        self.audio_queue.put(chunk)
 
             # None sinaliza fim para consumer
             self.audio_queue.put(None)
@@ -215,84 +241,416 @@ class AudioProducerThread(threading.Thread):
             self.audio_queue.put(None)
 
 
-class AudioConsumerThread(threading.Thread):
+# Frames entregues ao PortAudio por chamada do callback (~85ms a 24kHz).
+# Padrão conservador: o callback disputa o GIL com o G2P do producer.
+# TTS_FRAMES_POR_BUFFER permite reduzir (ex.: 512 ≈ 21ms) em máquinas folgadas.
+FRAMES_POR_BUFFER = 2048
+
+# Fade-out aplicado ao interromper playback (20ms)
+AMOSTRAS_FADE = 480
+
+# Sinaliza encerramento (SIGINT/SIGTERM) para producer e consumer;
+# padrão de processar_tts quando não recebe evento de cancelamento próprio
+_encerrando = threading.Event()
+
+# PyAudio e stream de saída reutilizados entre chamadas
+# (abrir stream negocia device, aloca buffers e cria a thread do PortAudio)
+_pyaudio_global = None
+_stream_global = None
+
+# Frames por callback, resolvido uma vez (stream e buffers dos consumers)
+_frames_por_buffer_global: Optional[int] = None
+
+# Consumer que o callback do stream (compartilhado) deve alimentar
+_consumer_ativo = None
+
+
+def _callback_stream(in_data, frame_count, time_info, status):
+    """Repassa o callback do PortAudio ao consumer da chamada atual."""
+    consumer = _consumer_ativo
+
+    if consumer is None:
+        return (bytes(frame_count * 4), pyaudio.paComplete)
+
+    return consumer.callback(frame_count, status)
+
+
+def obter_device_saida(p: pyaudio.PyAudio) -> Optional[int]:
     """
-    Desenfileira e reproduz chunks via PyAudio.
-    Bloqueia em queue.get() até ter dados ou receber sinal de término (None).
+    Lê device de saída de TTS_OUTPUT_DEVICE_INDEX.
+
+    Returns:
+        Índice do device ou None (device padrão do sistema)
     """
+    valor = os.environ.get("TTS_OUTPUT_DEVICE_INDEX", "").strip()
+    if not valor:
+        logger.debug("Usando device de saída padrão do sistema")
+        return None
 
-    def __init__(
-        self,
-        audio_queue: queue.Queue,
-        pyaudio_instance: pyaudio.PyAudio
-    ):
-        super().__init__(name="AudioConsumer", daemon=False)
-        self.audio_queue = audio_queue
-        self.pyaudio_instance = pyaudio_instance
-        self.erro = None
-        self.chunks_tocados = 0
+    try:
+        indice = int(valor)
+        nome = p.get_device_info_by_index(indice)['name']
+    except (ValueError, OSError, IOError) as e:
+        logger.warning(f"TTS_OUTPUT_DEVICE_INDEX inválido ({valor!r}): {e}. Usando device padrão")
+        return None
 
-    def run(self):
-        """Reproduz chunks conforme ficam disponíveis na fila."""
-        stream = None
+    logger.info(f"Device de saída: {indice} ({nome})")
+    return indice
 
+
+def obter_frames_por_buffer() -> int:
+    """
+    Lê TTS_FRAMES_POR_BUFFER uma única vez por processo (stream e buffer de
+    saída do consumer precisam do mesmo valor). Inválido, ausente ou fora
+    de [64, 16384] usa FRAMES_POR_BUFFER.
+    """
+    global _frames_por_buffer_global
+
+    if _frames_por_buffer_global is not None:
+        return _frames_por_buffer_global
+
+    frames = FRAMES_POR_BUFFER
+    valor = os.environ.get("TTS_FRAMES_POR_BUFFER", "").strip()
+
+    if valor:
         try:
-            logger.debug("[Consumer] Thread iniciada")
-
-            # TODO: Remover hardcoded output_device_index=9
-            # Device atual é específico do ambiente de dev (Arch + Hyprland).
-            # Em produção, deve usar device padrão do sistema ou ser configurável.
-            stream = self.pyaudio_instance.open(
-                format=pyaudio.paFloat32,
-                channels=1,
-                rate=24000,
-                output=True,
-                output_device_index=9,  # FIXME: hardcoded
-                frames_per_buffer=2048
-            )
-
-            logger.debug("[Consumer] Stream de áudio aberto")
-            logger.info("Iniciando playback...")
+            frames = int(valor)
+            if not 64 <= frames <= 16384:  # 16384 ≈ 680ms
+                raise ValueError("fora do intervalo 64-16384")
+            logger.debug(f"Frames por buffer: {frames} ({frames / 24:.0f}ms)")
+        except ValueError as e:
+            logger.warning(f"TTS_FRAMES_POR_BUFFER inválido ({valor!r}): {e}. Usando {FRAMES_POR_BUFFER}")
+            frames = FRAMES_POR_BUFFER
+
+    _frames_por_buffer_global = frames
+    return frames
+
 
-            while True:
-                # Bloqueia até ter chunk disponível
-                chunk = self.audio_queue.get()
+def obter_stream_audio() -> pyaudio.Stream:
+    """
+    Abre PyAudio e stream de saída (24kHz, mono, float32) na primeira chamada.
+    Stream é criado parado e em modo callback; consumer chama
+    start_stream/stop_stream por uso.
+    """
+    global _pyaudio_global, _stream_global
+
+    if _stream_global is None:
+        if _pyaudio_global is None:
+            _pyaudio_global = pyaudio.PyAudio()
+
+        device = obter_device_saida(_pyaudio_global)
+
+        _stream_global = _pyaudio_global.open(
+            format=pyaudio.paFloat32,
+            channels=1,
+            rate=24000,
+            output=True,
+            output_device_index=device,
+            frames_per_buffer=obter_frames_por_buffer(),
+            stream_callback=_callback_stream,
+            start=False
+        )
+        logger.debug("Stream de áudio aberto")
 
-                if chunk is None:
-                    logger.debug("[Consumer] Sinal de término recebido")
-                    break
+    return _stream_global
 
-                self.chunks_tocados += 1
-                duracao = len(chunk) / 24000
 
-                logger.debug(f"[Consumer] Tocando chunk {self.chunks_tocados} ({duracao:.2f}s)")
-                stream.write(chunk.tobytes())
+def liberar_audio():
+    """Fecha stream e encerra PyAudio (registrado via atexit)."""
+    global _pyaudio_global, _stream_global
+
+    if _stream_global is not None:
+        try:
+            _stream_global.close()
+        except Exception:
+            pass
+        _stream_global = None
 
-            logger.debug(f"[Consumer] Finalizado: {self.chunks_tocados} chunks tocados")
-            logger.info(f"Playback finalizado: {self.chunks_tocados} chunks")
+    if _pyaudio_global is not None:
+        _pyaudio_global.terminate()
+        _pyaudio_global = None
+        logger.debug("PyAudio encerrado")
+
+
+def elevar_prioridade_thread(prioridade_rt: int = 20):
+    """
+    Tenta dar à thread atual agendamento de tempo real (SCHED_FIFO) e fixá-la
+    no último core disponível, para acordar a tempo a cada buffer (~85ms).
+    Sem CAP_SYS_NICE, cai para nice negativo sem fixar core: thread de
+    prioridade normal presa a um core ocupado não migraria para um livre.
+    No Linux, pid 0 nas chamadas sched_* se refere à thread chamadora.
+    """
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(prioridade_rt))
+        logger.debug(f"Thread em SCHED_FIFO (prioridade {prioridade_rt})")
+    except (PermissionError, AttributeError, OSError):
+        try:
+            os.nice(-5)
+            logger.debug("Thread com nice -5")
+        except OSError:
+            logger.debug("Sem permissão para elevar prioridade da thread")
+        return
+
+    try:
+        core = max(os.sched_getaffinity(0))
+        os.sched_setaffinity(0, {core})
+        logger.debug(f"Thread fixada no core {core}")
+    except (AttributeError, OSError):
+        pass
+
+
+class AudioConsumer:
+    """
+    Reproduz chunks em modo callback: a thread do PortAudio chama callback()
+    a cada buffer e puxa amostras direto da fila, sem thread Python bloqueada
+    em stream.write. Fila vazia (producer atrasado) vira silêncio, não bloqueio.
+    Termina ao consumir o sinal de término (None) ou quando cancelar é setado.
+    """
+
+    def __init__(self, audio_queue: SPSCQueue, cancelar: threading.Event):
+        self.audio_queue = audio_queue
+        self.cancelar = cancelar
+        self.erro = None
+        self.chunks_tocados = 0
+        self.underruns = 0
+        self.underflows = 0  # reportados pelo PortAudio (buffer do device esvaziou)
+        self.stream_pronto = threading.Event()
+        self.finalizado = threading.Event()
+        self._stream = None
+        self._atual = None  # chunk sendo tocado
+        self._posicao = 0  # próxima amostra de _atual
+        # Dimensionado pelo valor do stream: sem alocação no callback
+        self._saida = np.zeros(obter_frames_por_buffer(), dtype=np.float32)
+        self._prioridade_ajustada = False
+
+    def iniciar(self):
+        """Inicia o stream (reaproveitado entre chamadas) com este consumer."""
+        global _consumer_ativo
+
+        try:
+            self._stream = obter_stream_audio()
+            _consumer_ativo = self
+            self._stream.start_stream()
+            logger.debug("[Consumer] Stream de áudio iniciado")
+            logger.info("Iniciando playback...")
 
         except Exception as e:
             self.erro = e
             logger.exception(f"[Consumer] Erro: {e}")
+            # Producer não deve bloquear nem gerar à toa sem playback
+            self.audio_queue.fechar()
+            self.finalizado.set()
 
         finally:
-            if stream:
-                try:
-                    stream.stop_stream()
-                    stream.close()
-                    logger.debug("[Consumer] Stream fechado")
-                except:
-                    pass
+            self.stream_pronto.set()
+
+    def aguardar(self):
+        """Bloqueia até o último chunk ser entregue e para o stream."""
+        global _consumer_ativo
+
+        while not self.finalizado.wait(timeout=0.1):
+            if self._stream is None or not self._stream.is_active():
+                break
+
+        if self._stream is not None:
+            try:
+                # stop_stream espera os buffers já entregues tocarem
+                self._stream.stop_stream()
+                logger.debug("[Consumer] Stream parado")
+            except Exception:
+                pass
+
+        _consumer_ativo = None
+        self.audio_queue.fechar()
+
+        logger.debug(f"[Consumer] Finalizado: {self.chunks_tocados} chunks tocados")
+        if self.underruns:
+            logger.debug(f"[Consumer] {self.underruns} buffers sem dados (producer atrasado)")
+        if self.underflows:
+            logger.warning(f"[Consumer] {self.underflows} underflows no device de áudio")
+        logger.info(f"Playback finalizado: {self.chunks_tocados} chunks")
+
+    def callback(self, frame_count: int, status: int) -> tuple:
+        """Preenche frame_count amostras a partir da fila (thread do PortAudio)."""
+        try:
+            if not self._prioridade_ajustada:
+                self._prioridade_ajustada = True
+                elevar_prioridade_thread()
+
+            if status & pyaudio.paOutputUnderflow:
+                # Callback entregou tarde: equivalente ao underrun do ALSA
+                self.underflows += 1
+
+            if frame_count > len(self._saida):
+                # Não esperado (stream aberto com frames fixos); só por segurança
+                self._saida = np.zeros(frame_count, dtype=np.float32)
+
+            saida = self._saida[:frame_count]
+            preenchido = 0
+            fim = False
+
+            while preenchido < frame_count:
+                if self._atual is None:
+                    if self.audio_queue.qsize() == 0:
+                        # Producer atrasado: completa com silêncio
+                        if self.chunks_tocados:
+                            self.underruns += 1
+                        break
+
+                    item = self.audio_queue.get()
+                    if item is None:
+                        logger.debug("[Consumer] Sinal de término recebido")
+                        fim = True
+                        break
+
+                    self._atual = item
+                    self._posicao = 0
+                    self.chunks_tocados += 1
+                    logger.debug(
+                        "[Consumer] Tocando chunk {} ({:.2f}s)",
+                        self.chunks_tocados, len(item) / 24000
+                    )
+
+                n = min(frame_count - preenchido, len(self._atual) - self._posicao)
+                saida[preenchido:preenchido + n] = self._atual[self._posicao:self._posicao + n]
+                preenchido += n
+                self._posicao += n
+
+                if self._posicao >= len(self._atual):
+                    self._atual = None
+
+            saida[preenchido:] = 0.0
+
+            if self.cancelar.is_set():
+                logger.debug("[Consumer] Encerramento solicitado, interrompendo playback")
+                fade = min(AMOSTRAS_FADE, frame_count)
+                saida[:fade] *= np.linspace(1.0, 0.0, fade, dtype=np.float32)
+                saida[fade:] = 0.0
+                fim = True
+
+            if fim:
+                # Fecha a fila: producer bloqueado em put() (fila cheia ao
+                # interromper) desbloqueia e para de gerar
+                self.audio_queue.fechar()
+                self.finalizado.set()
+                return (saida.tobytes(), pyaudio.paComplete)
+
+            return (saida.tobytes(), pyaudio.paContinue)
+
+        except Exception as e:
+            self.erro = e
+            logger.exception(f"[Consumer] Erro: {e}")
+            self.audio_queue.fechar()
+            self.finalizado.set()
+            return (bytes(frame_count * 4), pyaudio.paAbort)
 
 
 # ============================================================================
 # INICIALIZAÇÃO E PROCESSAMENTO
 # ============================================================================
 
-def inicializar_pipeline() -> Optional[KPipeline]:
+def usar_bf16() -> bool:
+    """
+    Inferência em bfloat16 só quando pedida (TTS_BF16=1), na GPU e com
+    suporte do hardware (Ampere+). Opcional porque o modelo foi treinado em
+    fp32: bf16 perde precisão e pode alterar o timbre.
+
+    Checa a compute capability em vez de is_bf16_supported(): versões
+    recentes do torch respondem True em GPUs antigas (bf16 emulado, mais
+    lento que fp32). Sem bf16 nativo fica em fp32; fp16 não é usado
+    porque o vocoder pode estourar a faixa do fp16.
+    """
+    if os.environ.get("TTS_BF16") != "1":
+        return False
+
+    return torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 8
+
+
+def aquecer_pipeline(pipeline: KPipeline):
+    """
+    Sintetiza uma frase descartável no mesmo contexto do producer
+    (inference_mode + autocast). Tira do primeiro pedido a inicialização
+    preguiçosa (contexto CUDA, carga de kernels, G2P) e as primeiras alocações
+    do caching allocator; não cobre os shapes dos textos reais, que variam
+    por chunk. Com torch.compile, dispara a compilação.
+    """
+    tempo_inicio = time.perf_counter()
+
+    with torch.inference_mode(), \
+            torch.autocast('cuda', dtype=torch.bfloat16, enabled=usar_bf16()):
+        for _ in pipeline("Olá.", voice='pf_dora'):
+            pass
+
+    # Garante que o trabalho enfileirado na GPU terminou antes de liberar o pipeline
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+
+    tempo_aquecimento = (time.perf_counter() - tempo_inicio) * 1000
+    logger.debug(f"Pipeline aquecido em {tempo_aquecimento:.0f}ms")
+
+
+def compilar_pipeline(pipeline: KPipeline) -> bool:
+    """
+    Compila o forward do modelo com torch.compile (reduce-overhead: fusão de
+    kernels + CUDA graphs). Custa dezenas de segundos por processo, então só
+    compensa em processos de longa duração. Volta ao modo eager se falhar.
+    """
+    forward_original = pipeline.model.forward
+
+    try:
+        logger.info("Compilando modelo (torch.compile)...")
+        pipeline.model.forward = torch.compile(
+            forward_original,
+            mode="reduce-overhead",
+            fullgraph=False
+        )
+        # Compilação é preguiçosa: o aquecimento dispara e valida
+        aquecer_pipeline(pipeline)
+        return True
+
+    except Exception as e:
+        logger.warning(f"torch.compile falhou, usando modo eager: {e}")
+        pipeline.model.forward = forward_original
+        return False
+
+
+def quantizar_pipeline(pipeline: KPipeline) -> bool:
+    """
+    Quantização dinâmica INT8 das camadas Linear (somente CPU): pesos em int8,
+    GEMMs via oneDNN (VNNI quando disponível). Pode alterar levemente o timbre,
+    por isso é opcional. Volta ao modelo FP32 se a síntese de teste falhar.
+    """
+    modelo_original = pipeline.model
+
+    try:
+        logger.info("Quantizando modelo (INT8 dinâmico)...")
+        pipeline.model = torch.ao.quantization.quantize_dynamic(
+            modelo_original,
+            {torch.nn.Linear},
+            dtype=torch.qint8
+        )
+        # Erros de quantização só aparecem no forward: o aquecimento valida
+        aquecer_pipeline(pipeline)
+        return True
+
+    except Exception as e:
+        logger.warning(f"Quantização falhou, usando FP32: {e}")
+        pipeline.model = modelo_original
+        return False
+
+
+def inicializar_pipeline(
+    compilar: bool = False,
+    aquecer: bool = False,
+    quantizar: bool = False
+) -> Optional[KPipeline]:
     """
     Carrega modelo Kokoro (82M parâmetros) e voz pf_dora.
     Prefere CUDA se disponível, fallback para CPU.
+    compilar=True aplica torch.compile (somente CUDA).
+    quantizar=True aplica quantização INT8 dinâmica (somente CPU).
+    aquecer=True roda uma síntese descartável (somente CUDA); só compensa
+    quando o pipeline é carregado antes do primeiro pedido (daemon).
     """
     logger.info("Inicializando pipeline...")
     logger.debug("Lang: pt-br (p), Voz: pf_dora, Repo: hexgrad/Kokoro-82M")
@@ -303,6 +661,11 @@ def inicializar_pipeline() -> Optional[KPipeline]:
         device = 'cuda'
         gpu_nome = torch.cuda.get_device_name(0)
         logger.debug(f"CUDA disponível: {gpu_nome}")
+
+        # Matmul em TF32 nas GPUs Ampere+ sem alterar os pesos.
+        # cudnn.benchmark fica desligado: o tamanho de cada chunk muda o shape
+        # das convs do vocoder e cada shape novo dispararia um autotune
+        torch.set_float32_matmul_precision('high')
     else:
         device = 'cpu'
         logger.warning("CUDA não disponível, usando CPU (mais lento)")
@@ -320,9 +683,18 @@ def inicializar_pipeline() -> Optional[KPipeline]:
         logger.debug(f"Pipeline inicializado em {tempo_init:.0f}ms")
 
         # Pré-carrega voz para evitar latência no primeiro uso
+        # (KPipeline guarda o tensor em pipeline.voices)
         logger.debug("Carregando voz pf_dora...")
         pipeline.load_voice('pf_dora')
 
+        # Compilação já inclui o aquecimento
+        if compilar and cuda_disponivel:
+            compilar_pipeline(pipeline)
+        elif aquecer and cuda_disponivel:
+            aquecer_pipeline(pipeline)
+        elif quantizar and not cuda_disponivel:
+            quantizar_pipeline(pipeline)
+
         logger.info(f"Pipeline pronto (device: {device})")
         return pipeline
 
@@ -331,46 +703,58 @@ def inicializar_pipeline() -> Optional[KPipeline]:
         return None
 
 
-def processar_tts(texto: str, pipeline: KPipeline) -> bool:
+def processar_tts(
+    texto: str,
+    pipeline: KPipeline,
+    cancelar: Optional[threading.Event] = None
+) -> bool:
     """
-    Orquestra producer/consumer threads para streaming.
+    Orquestra producer thread e consumer (callback do PortAudio) para streaming.
     
-    Consumer inicia primeiro para evitar perda de chunks iniciais.
-    Delay de 100ms garante que stream esteja pronto antes de producer começar.
+    Producer já gera o primeiro chunk enquanto o stream é iniciado;
+    só enfileira após o evento stream_pronto (sem sleep fixo).
+    cancelar interrompe esta chamada (padrão: _encerrando, setado pelos sinais);
+    o daemon passa um evento por pedido.
     """
+    global _buffers_audio_global
+
+    if cancelar is None:
+        cancelar = _encerrando
+
     logger.info(f"Processando texto: {len(texto)} caracteres")
 
     # Fila limitada a 10 chunks previne uso excessivo de memória
-    audio_queue = queue.Queue(maxsize=10)
-    p = pyaudio.PyAudio()
+    audio_queue = SPSCQueue(maxsize=TAMANHO_FILA_AUDIO)
+
+    if _buffers_audio_global is None:
+        _buffers_audio_global = alocar_buffers_audio(TAMANHO_FILA_AUDIO + 2)
+
+    consumer = AudioConsumer(audio_queue=audio_queue, cancelar=cancelar)
 
     producer = AudioProducerThread(
         texto=texto,
         audio_queue=audio_queue,
         pipeline=pipeline,
+        buffers=_buffers_audio_global,
+        stream_pronto=consumer.stream_pronto,
+        cancelar=cancelar,
         voz='pf_dora',
-        speed=1.0
+        speed=1.0,
+        bf16=usar_bf16()
     )
 
-    consumer = AudioConsumerThread(
-        audio_queue=audio_queue,
-        pyaudio_instance=p
-    )
-
-    logger.debug("Iniciando threads de produção e consumo")
+    logger.debug("Iniciando produção e consumo")
     tempo_inicio = time.perf_counter()
 
-    # Consumer primeiro, depois producer
-    consumer.start()
-    time.sleep(0.1)
     producer.start()
+    consumer.iniciar()
 
-    # Aguarda ambas finalizarem
+    # Aguarda último chunk tocar (ou interrupção) antes de juntar o producer:
+    # aguardar() fecha a fila, então o producer nunca fica preso em put()
+    consumer.aguardar()
     producer.join()
-    consumer.join()
 
     tempo_total = (time.perf_counter() - tempo_inicio) * 1000
-    p.terminate()
 
     # Verifica se houve erros
     if producer.erro or consumer.erro:
@@ -391,20 +775,39 @@ def processar_tts(texto: str, pipeline: KPipeline) -> bool:
 # (evita recarregar modelo a cada execução)
 _pipeline_global = None
 
+# Pool de buffers de áudio, alocado na primeira chamada de processar_tts
+_buffers_audio_global = None
+
 
 def cleanup_handler(signum, frame):
-    """Handler para Ctrl+C - encerra graciosamente."""
-    logger.warning("Interrupção detectada (SIGINT)")
+    """
+    Handler para Ctrl+C / SIGTERM fora do playback (captura, carga do modelo):
+    encerra na hora; recursos de áudio são liberados via atexit.
+    """
+    logger.warning(f"Interrupção detectada ({signal.Signals(signum).name})")
     logger.info("Encerrando...")
     sys.exit(130)
 
 
+def interromper_handler(signum, frame):
+    """
+    Handler para Ctrl+C / SIGTERM durante processar_tts - encerra graciosamente.
+    Só sinaliza as threads: consumer faz fade-out e para o stream, producer
+    interrompe a geração.
+    """
+    logger.warning(f"Interrupção detectada ({signal.Signals(signum).name})")
+    logger.info("Encerrando...")
+    _encerrando.set()
+
+
 def main():
     """Fluxo principal: captura → limpa → sintetiza → reproduz."""
     global _pipeline_global
 
     configurar_logging()
     signal.signal(signal.SIGINT, cleanup_handler)
+    signal.signal(signal.SIGTERM, cleanup_handler)
+    atexit.register(liberar_audio)
 
     logger.info("=" * 60)
     logger.info("TTS de Seleção Primária - Kokoro Streaming")
@@ -436,15 +839,31 @@ def main():
 
     # 3. Inicializa pipeline (reutiliza se já carregado)
     if _pipeline_global is None:
-        _pipeline_global = inicializar_pipeline()
+        # TTS_COMPILAR=1: torch.compile (vale para processos de longa duração)
+        # TTS_QUANTIZAR=1: INT8 dinâmico quando rodando em CPU
+        _pipeline_global = inicializar_pipeline(
+            compilar=os.environ.get("TTS_COMPILAR") == "1",
+            quantizar=os.environ.get("TTS_QUANTIZAR") == "1"
+        )
 
         if _pipeline_global is None:
             logger.error("Falha ao inicializar pipeline")
             return 1
 
     # 4. Processa TTS
+    # Handler só sinaliza durante o playback (fade-out); fora dele Ctrl+C
+    # precisa encerrar mesmo com a thread principal presa em I/O
     logger.info("Iniciando síntese de voz...")
-    sucesso = processar_tts(texto_limpo, _pipeline_global)
+    signal.signal(signal.SIGINT, interromper_handler)
+    signal.signal(signal.SIGTERM, interromper_handler)
+    try:
+        sucesso = processar_tts(texto_limpo, _pipeline_global)
+    finally:
+        signal.signal(signal.SIGINT, cleanup_handler)
+        signal.signal(signal.SIGTERM, cleanup_handler)
+
+    if _encerrando.is_set():
+        return 130
 
     if sucesso:
         logger.info("Concluído com sucesso!")
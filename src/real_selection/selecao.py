@@ -0,0 +1,325 @@
+"""
+Real Selection - Síntese de voz em tempo real a partir de texto selecionado
+Copyright (C) 2025 Renato Barros
+
+Este programa é software livre: você pode redistribuí-lo e/ou modificá-lo
+sob os termos da GNU General Public License conforme publicada pela
+Free Software Foundation, versão 3 da Licença, ou (a seu critério)
+qualquer versão posterior.
+
+Este programa é distribuído na esperança de que seja útil, mas SEM QUALQUER
+GARANTIA; sem mesmo a garantia implícita de COMERCIALIZAÇÃO ou ADEQUAÇÃO A UM
+PROPÓSITO ESPECÍFICO. Consulte a GNU General Public License para mais detalhes.
+
+Você deve ter recebido uma cópia da GNU General Public License junto com este
+programa. Caso contrário, consulte <https://www.gnu.org/licenses/>.
+"""
+
+"""
+Captura da seleção primária do Wayland e limpeza do texto para TTS.
+
+Separado de main.py para não importar torch/kokoro: usado tanto pelo fluxo
+completo quanto pelo cliente leve do daemon (cliente.py).
+
+Dependências externas:
+- wl-clipboard: captura seleção primária
+"""
+
+import os
+import subprocess
+import re
+import select
+import threading
+import time
+from typing import Iterator, Optional
+
+from loguru import logger
+
+
+# ============================================================================
+# CAPTURA E LIMPEZA DE TEXTO
+# ============================================================================
+
+# Compilado uma única vez (evita lookup no cache do re a cada chamada).
+# Sem lookarounds: só localiza separadores de parágrafo (2+ quebras), o resto
+# da limpeza é feito com split/join em C em cada parágrafo.
+_RE_PARAGRAFOS = re.compile(r'(\n{2,})')
+
+# Leitura da seleção limitada a 1 MiB: além disso são horas de áudio
+LIMITE_SELECAO_BYTES = 1 << 20
+
+# Separação de parágrafo (capturada, para ser mantida) ou fim de frase
+# (pontuação seguida de espaço). Parágrafo primeiro: "Fim.\n\nTítulo" é parágrafo
+_RE_SENTENCAS = re.compile(r'(\n{2,})|(?<=[.!?])\s+')
+
+# Tamanho alvo (caracteres) das janelas enviadas ao pipeline após a 1ª frase
+TAMANHO_JANELA_TEXTO = 300
+
+# Primeira janela mínima: evita sintetizar só "Sr." ou "Dr." isolado
+_MINIMO_PRIMEIRA_JANELA = 20
+
+
+class MonitorSelecao(threading.Thread):
+    """
+    Mantém um único `wl-paste --primary --watch` rodando e guarda a última
+    seleção recebida. Para processos de longa duração: troca o fork+exec de
+    wl-paste a cada captura por uma leitura em memória.
+
+    Cada mudança de seleção é emitida seguida de \0 (delimitador).
+    """
+
+    def __init__(self):
+        super().__init__(name="MonitorSelecao", daemon=True)
+        self._lock = threading.Lock()
+        self._ultima = None
+        self._atual = bytearray()  # seleção em andamento (até o próximo \0)
+        self._truncada = False  # passou de LIMITE_SELECAO_BYTES: descarta até \0
+        self._parando = False
+        self.processo = None
+
+    def run(self):
+        try:
+            self.processo = subprocess.Popen(
+                ["wl-paste", "--primary", "--watch", "sh", "-c", "cat; printf '\\0'"],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        except FileNotFoundError:
+            logger.error("wl-clipboard não está instalado")
+            return
+
+        # parar() chamado antes do Popen terminar não viu o processo
+        if self._parando:
+            self.processo.terminate()
+
+        logger.debug(f"Monitor de seleção iniciado (PID: {self.processo.pid})")
+
+        for bloco in iter(lambda: self.processo.stdout.read1(65536), b""):
+            self._consumir(bloco)
+
+        logger.debug("Monitor de seleção finalizado")
+
+    def _consumir(self, bloco: bytes):
+        """
+        Acumula bytes da seleção atual e publica a cada \0. Cada byte é
+        copiado uma vez (sem re-split do acumulado); acima do limite o resto
+        da seleção é descartado até o próximo delimitador.
+        """
+        dados = memoryview(bloco)
+        inicio = 0
+
+        while True:
+            fim = bloco.find(b"\0", inicio)
+            pedaco = dados[inicio:] if fim < 0 else dados[inicio:fim]
+
+            if not self._truncada:
+                espaco = LIMITE_SELECAO_BYTES - len(self._atual)
+                if len(pedaco) > espaco:
+                    pedaco = pedaco[:espaco]
+                    self._truncada = True
+                self._atual += pedaco
+
+            if fim < 0:
+                return
+
+            self._publicar()
+            inicio = fim + 1
+
+    def _publicar(self):
+        if self._truncada:
+            logger.warning(f"Seleção maior que {LIMITE_SELECAO_BYTES // 1024} KiB, truncada")
+
+        texto = self._atual.decode("utf-8", errors="replace").strip()
+        self._atual = bytearray()
+        self._truncada = False
+
+        with self._lock:
+            self._ultima = texto
+
+    def ultima(self) -> Optional[str]:
+        """Última seleção vista, ou None se nada chegou ainda."""
+        with self._lock:
+            return self._ultima
+
+    def parar(self):
+        self._parando = True
+        if self.processo and self.processo.poll() is None:
+            self.processo.terminate()
+
+
+# Monitor opcional (iniciado por quem vive o suficiente para aproveitá-lo)
+_monitor_selecao: Optional[MonitorSelecao] = None
+
+
+def iniciar_monitor_selecao() -> MonitorSelecao:
+    """Inicia (uma vez) o monitor de seleção em background."""
+    global _monitor_selecao
+
+    if _monitor_selecao is None:
+        _monitor_selecao = MonitorSelecao()
+        _monitor_selecao.start()
+
+    return _monitor_selecao
+
+
+def _ler_saida(processo: subprocess.Popen, limite: int, timeout: float) -> tuple:
+    """
+    Lê stdout do processo à medida que chega, até EOF ou limite bytes.
+
+    Returns:
+        (dados, truncado)
+
+    Raises:
+        subprocess.TimeoutExpired: se a leitura passar de timeout segundos
+    """
+    prazo = time.monotonic() + timeout
+    fd = processo.stdout.fileno()
+    partes = []
+    total = 0
+
+    while total < limite:
+        restante = prazo - time.monotonic()
+        if restante <= 0:
+            raise subprocess.TimeoutExpired(processo.args, timeout)
+
+        prontos, _, _ = select.select([fd], [], [], restante)
+        if not prontos:
+            continue
+
+        bloco = os.read(fd, min(65536, limite - total))
+        if not bloco:
+            return b"".join(partes), False
+
+        partes.append(bloco)
+        total += len(bloco)
+
+    return b"".join(partes), True
+
+
+def obter_selecao_primaria() -> Optional[str]:
+    """
+    Captura via wl-paste --primary (seleção do mouse no Wayland).
+    Timeout de 2s previne travamentos se clipboard não responder.
+    Lê no máximo LIMITE_SELECAO_BYTES e decodifica uma única vez no final.
+    Com monitor ativo, usa a seleção já recebida sem criar processo.
+    """
+    if _monitor_selecao is not None and _monitor_selecao.is_alive():
+        texto = _monitor_selecao.ultima()
+        if texto is not None:
+            logger.debug(f"Seleção via monitor: {len(texto)} caracteres")
+            return texto
+
+    logger.debug("Executando wl-paste --primary")
+
+    try:
+        with subprocess.Popen(
+            ["wl-paste", "--primary"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        ) as processo:
+            try:
+                dados, truncado = _ler_saida(processo, LIMITE_SELECAO_BYTES, timeout=2)
+            except subprocess.TimeoutExpired:
+                processo.kill()
+                raise
+
+            # Truncado: wl-paste ainda estaria escrevendo o resto
+            if truncado:
+                processo.kill()
+            processo.wait()
+
+        if truncado:
+            logger.warning(f"Seleção maior que {LIMITE_SELECAO_BYTES // 1024} KiB, truncada")
+        elif processo.returncode != 0:
+            # Seleção vazia não é erro (wl-paste sai com código != 0)
+            logger.debug("Seleção primária vazia")
+            return ""
+
+        texto = dados.decode("utf-8", errors="replace").strip()
+        logger.debug(f"Texto capturado: {len(texto)} caracteres")
+        return texto
+
+    except FileNotFoundError:
+        logger.error("wl-clipboard não está instalado")
+        logger.error("Instale com: sudo pacman -S wl-clipboard")
+        return None
+
+    except subprocess.TimeoutExpired:
+        logger.error("Timeout ao capturar seleção")
+        return None
+
+    except Exception as e:
+        logger.exception(f"Erro inesperado ao capturar seleção: {e}")
+        return None
+
+
+def limpar_texto_para_tts(texto: str) -> Optional[str]:
+    """
+    Remove quebras de linha indesejadas (PDFs, terminal) mas preserva parágrafos.
+    
+    Estratégia:
+    - Quebra simples (\n) → espaço (junta linhas do mesmo parágrafo)
+    - Quebra dupla (\n\n) → mantém (separação entre parágrafos)
+    - Sem parágrafos: split/join em C, sem passar pelo regex
+    """
+    if not texto:
+        return None
+
+    logger.debug("Limpando texto para TTS")
+    logger.debug(f"Original: {len(texto)} chars, {texto.count(chr(10))} quebras")
+
+    if '\n' not in texto and '\t' not in texto and '  ' not in texto:
+        # Linha única já normalizada (títulos, URLs): nada a substituir
+        texto_limpo = texto.strip()
+    elif '\n\n' not in texto:
+        # Caso comum (linha única, terminal): nenhum parágrafo a preservar
+        texto_limpo = ' '.join(texto.split())
+    else:
+        # Índices pares: parágrafos (\n isolado e espaços → um espaço);
+        # ímpares: separadores \n\n+, mantidos como estão
+        partes = _RE_PARAGRAFOS.split(texto)
+        partes[::2] = [' '.join(paragrafo.split()) for paragrafo in partes[::2]]
+        texto_limpo = ''.join(partes).strip()
+
+    logger.debug(f"Limpo: {len(texto_limpo)} chars, {texto_limpo.count(chr(10))} quebras")
+
+    return texto_limpo if texto_limpo else None
+
+
+def iter_sentencas(texto: str, limite: int = TAMANHO_JANELA_TEXTO) -> Iterator[str]:
+    """
+    Divide o texto em janelas alinhadas a frases para síntese incremental.
+
+    A primeira frase sai sozinha (se tiver ao menos _MINIMO_PRIMEIRA_JANELA
+    caracteres): o primeiro áudio não depende do tamanho do texto. As
+    seguintes são agrupadas até ~limite caracteres para não multiplicar
+    chamadas ao modelo. Frase maior que o limite sai inteira (Kokoro divide
+    internamente). Quebras de parágrafo são mantidas dentro da janela: o
+    Kokoro as usa como fronteira de segmento (pausa entre título e corpo).
+    """
+    # Índices pares: frases; ímpares: separador (\n\n+ ou None = espaço)
+    partes = _RE_SENTENCAS.split(texto)
+    janela = ""
+    primeira = True
+
+    for i in range(0, len(partes), 2):
+        sentenca = partes[i]
+        if not sentenca:
+            continue
+
+        separador = (partes[i - 1] or " ") if i else " "
+
+        if janela and len(janela) + len(separador) + len(sentenca) > limite:
+            yield janela
+            janela = sentenca
+        else:
+            janela = f"{janela}{separador}{sentenca}" if janela else sentenca
+
+        if primeira and len(janela) >= _MINIMO_PRIMEIRA_JANELA:
+            primeira = False
+            yield janela
+            janela = ""
+
+    if janela:
+        yield janela
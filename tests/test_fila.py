@@ -0,0 +1,98 @@
+"""Testes da fila SPSC entre producer e callback de áudio."""
+
+import threading
+
+from real_selection.fila import SPSCQueue
+
+
+def _rodar_em_thread(alvo) -> threading.Thread:
+    thread = threading.Thread(target=alvo, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_fifo():
+    """Itens saem na ordem em que entraram, inclusive após dar a volta no ring."""
+    fila = SPSCQueue(maxsize=3)
+
+    for i in range(3):
+        fila.put(i)
+    assert [fila.get(), fila.get()] == [0, 1]
+
+    fila.put(3)
+    fila.put(4)
+    assert [fila.get(), fila.get(), fila.get()] == [2, 3, 4]
+    assert fila.qsize() == 0
+
+
+def test_fechar_desbloqueia_put_com_fila_cheia():
+    """Interrupção com fila cheia: producer preso em put() precisa sair."""
+    fila = SPSCQueue(maxsize=2)
+    fila.put("a")
+    fila.put("b")
+
+    producer = _rodar_em_thread(lambda: fila.put("c"))
+    producer.join(timeout=0.2)
+    assert producer.is_alive()  # backpressure: bloqueado
+
+    fila.fechar()
+    producer.join(timeout=1.0)
+    assert not producer.is_alive()
+
+
+def test_put_apos_fechar_descarta():
+    """Sinal de término (None) após fechar não bloqueia nem é enfileirado."""
+    fila = SPSCQueue(maxsize=1)
+    fila.put("a")
+    fila.fechar()
+
+    producer = _rodar_em_thread(lambda: fila.put(None))
+    producer.join(timeout=1.0)
+
+    assert not producer.is_alive()
+    assert fila.qsize() == 1
+
+
+def test_fechar_desbloqueia_get_com_fila_vazia():
+    """Consumer bloqueado em get() recebe None ao fechar."""
+    fila = SPSCQueue(maxsize=2)
+    resultado = []
+
+    consumer = _rodar_em_thread(lambda: resultado.append(fila.get()))
+    consumer.join(timeout=0.2)
+    assert consumer.is_alive()
+
+    fila.fechar()
+    consumer.join(timeout=1.0)
+    assert not consumer.is_alive()
+    assert resultado == [None]
+
+
+def test_get_esvazia_itens_antes_de_none():
+    """Itens já enfileirados continuam disponíveis depois de fechar."""
+    fila = SPSCQueue(maxsize=3)
+    fila.put("a")
+    fila.put("b")
+    fila.fechar()
+
+    assert [fila.get(), fila.get(), fila.get()] == ["a", "b", None]
+
+
+def test_producer_consumer_concorrentes():
+    """Muitos itens por uma fila pequena chegam completos e em ordem."""
+    fila = SPSCQueue(maxsize=4)
+    total = 5000
+    recebidos = []
+
+    def consumir():
+        while (item := fila.get()) is not None:
+            recebidos.append(item)
+
+    consumer = _rodar_em_thread(consumir)
+    for i in range(total):
+        fila.put(i)
+    fila.put(None)
+
+    consumer.join(timeout=5.0)
+    assert not consumer.is_alive()
+    assert recebidos == list(range(total))
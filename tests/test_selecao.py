@@ -0,0 +1,64 @@
+"""Testes da limpeza de texto e da divisão em janelas para síntese."""
+
+from real_selection import selecao
+from real_selection.selecao import MonitorSelecao, iter_sentencas, limpar_texto_para_tts
+
+
+def test_limpar_preserva_paragrafos():
+    """Quebra simples vira espaço; quebra dupla é mantida."""
+    texto = "Linha 1\nLinha 2\n\nParágrafo 2"
+    assert limpar_texto_para_tts(texto) == "Linha 1 Linha 2\n\nParágrafo 2"
+
+
+def test_janelas_mantem_quebras_de_paragrafo():
+    """Títulos não podem emendar no corpo (Kokoro segmenta em \\n)."""
+    texto = limpar_texto_para_tts(
+        "Intro.\n\nCapítulo 1\n\nO texto continua.\n\nCapítulo 2\n\nMais."
+    )
+    janelas = list(iter_sentencas(texto))
+
+    assert "\n\n".join(janelas) == texto
+    assert not any("Capítulo 1 O" in j or "Capítulo 2 Mais" in j for j in janelas)
+
+
+def test_primeira_janela_curta_e_sem_abreviacao_isolada():
+    """Primeira frase sai sozinha, mas "Sr." não é sintetizado isolado."""
+    janelas = list(iter_sentencas("Sr. João chegou cedo hoje. Depois saiu."))
+    assert janelas[0] == "Sr. João chegou cedo hoje."
+
+
+def test_janelas_respeitam_limite():
+    """Após a primeira, janelas agrupam frases até o limite."""
+    texto = "Primeira frase bem longa aqui. " + "Frase média aqui. " * 40
+    janelas = list(iter_sentencas(texto.strip(), limite=100))
+
+    assert janelas[0] == "Primeira frase bem longa aqui."
+    assert all(len(j) <= 100 for j in janelas)
+    assert " ".join(janelas) == texto.strip()
+
+
+def test_monitor_publica_ultima_selecao_entre_blocos():
+    """Seleções chegam fragmentadas; vale a última completa (até \\0)."""
+    monitor = MonitorSelecao()
+
+    monitor._consumir(b"prim")
+    assert monitor.ultima() is None
+
+    monitor._consumir(b"eira\0segu")
+    assert monitor.ultima() == "primeira"
+
+    monitor._consumir(b"nda\0")
+    assert monitor.ultima() == "segunda"
+
+
+def test_monitor_trunca_selecao_grande(monkeypatch):
+    """Acima do limite descarta o resto até o próximo delimitador."""
+    monkeypatch.setattr(selecao, "LIMITE_SELECAO_BYTES", 8)
+    monitor = MonitorSelecao()
+
+    monitor._consumir(b"0123456789")
+    monitor._consumir(b"abcdef\0curta\0")
+    assert monitor.ultima() == "curta"
+
+    monitor._consumir(b"0123456789\0")
+    assert monitor.ultima() == "01234567"